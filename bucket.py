@@ -1,37 +1,71 @@
-from operator import attrgetter
-from typing import Dict, Union, Optional, List, Tuple
+from typing import Dict, Union, Optional, List, Set
+from enum import Enum
 from node_data import NodeData
 from kad_types import NodeId
-from math import ceil
-from time import time
-from lock import ExtRLock
+from lock import ExtLock
+from clock import Clock
+
+
+class BucketAddResult(Enum):
+    """
+    The result of a request to add a node to a k-bucket.
+    """
+    ADDED = 0
+    """The node was added to the k-bucket."""
+    ALREADY_IN = 1
+    """The node was already present in the k-bucket prior to the request to add it."""
+    FULL = 2
+    """The node was not added because the k-bucket is full."""
 
 
 class Bucket:
     """
     This class implements a k-bucket.
+
+    Please note that the nodes are not stored as a collection of NodeData objects. Instead, the bucket holds
+    parallel lists: one for the node IDs, one for the "last seen" dates and one for the sequence numbers (the
+    date at position i is the one of the node which ID is at position i). Instances of NodeData are only built
+    on demand.
+
+    Please note: the positions of the nodes within the lists do not follow any order. Two nodes may have the same
+    "last seen" date (for example, when several nodes are inserted at once). In this case, the node with the
+    smallest sequence number is the least recently seen one.
     """
 
     def __init__(self, size_limit: int):
         self.__size_limit = size_limit
-        self.__shared_nodes: Dict[NodeId, NodeData] = dict()
-        self.__lock_nodes = ExtRLock("Bucket.nodes")
+        self.__shared_ids: List[NodeId] = []
+        """The IDs of the nodes stored in the bucket."""
+        self.__shared_last_seen_dates: List[int] = []
+        """The "last seen" dates of the nodes stored in the bucket."""
+        self.__shared_sequences: List[int] = []
+        """The sequence numbers of the nodes stored in the bucket. The sequence number of a node is set when the
+        node is inserted into the bucket, and each time the node is declared as the most recently seen one."""
+        self.__shared_next_sequence: int = 0
+        """The next sequence number."""
+        self.__shared_positions: Dict[NodeId, int] = dict()
+        """This property associates a node ID with its position within the two lists above."""
+        self.__lock_nodes = ExtLock("Bucket.nodes")
+
+    def __nodes_data(self) -> List[NodeData]:
+        return [NodeData(identifier, last_seen_date=date)
+                for identifier, date in zip(self.__shared_ids, self.__shared_last_seen_dates)]
 
     def contains_node(self, identifier: NodeId) -> bool:
         with self.__lock_nodes.set("bucket.Bucket.contains_node"):
-            return identifier in self.__shared_nodes
+            return identifier in self.__shared_positions
 
     def count(self) -> int:
         with self.__lock_nodes.set("bucket.Bucket.count"):
-            return len(self.__shared_nodes)
+            return len(self.__shared_ids)
 
     def get_all_nodes_data(self) -> List[NodeData]:
         with self.__lock_nodes.set("bucket.Bucket.get_all_nodes_data"):
-            return list(self.__shared_nodes.values())
+            return self.__nodes_data()
 
     def get_all_nodes_ids(self) -> List[NodeId]:
         with self.__lock_nodes.set("bucket.Bucket.get_all_nodes_ids"):
-            return [p.identifier for p in self.__shared_nodes.values()]
+            return list(self.__shared_ids)
 
     def get_closest_nodes(self, node_id: NodeId, count: int) -> List[NodeData]:
         """
@@ -43,40 +77,52 @@ class Bucket:
         """
         with self.__lock_nodes.set("bucket.Bucket.get_closest_nodes"):
             result: List[NodeData] = []
-            if len(self.__shared_nodes):
-                result = sorted(self.__shared_nodes.values(), key=lambda node: node.identifier ^ node_id)[0:count]
+            if len(self.__shared_ids):
+                result = sorted(self.__nodes_data(), key=lambda node: node.identifier ^ node_id)[0:count]
             return result
 
-    def add_node(self, node_data: NodeData) -> Tuple[bool, bool]:
+    def add_node(self, node_data: NodeData) -> BucketAddResult:
         """
         Add a node to the bucket.
         :param node_data: the node to add.
-        :return: the method returns 2 values:
-        - the first value indicates whether the node was added to the bucket or not. The value True means that
-          the node was added to the bucket (please note that in this case the second value is always False).
-        - the second value indicates whether the node was already present in the bucket prior to the request to
-          add it, or not. The value True means hat the node was already present to the bucket.
+        :return: the method returns the result of the request (see class BucketAddResult).
         """
         with self.__lock_nodes.set("bucket.Bucket.add_node"):
-            if self.contains_node(node_data.identifier):
-                return False, True
+            if node_data.identifier in self.__shared_positions:
+                return BucketAddResult.ALREADY_IN
 
-            if len(self.__shared_nodes) == self.__size_limit:
-                return False, False
+            if len(self.__shared_ids) == self.__size_limit:
+                return BucketAddResult.FULL
 
-            self.__shared_nodes[node_data.identifier] = node_data
-            return True, False
+            self.__shared_positions[node_data.identifier] = len(self.__shared_ids)
+            self.__shared_ids.append(node_data.identifier)
+            self.__shared_last_seen_dates.append(node_data.last_seen_date)
+            self.__shared_sequences.append(self.__shared_next_sequence)
+            self.__shared_next_sequence += 1
+            return BucketAddResult.ADDED
 
     def remove_node(self, node: Union[NodeId, NodeData]) -> None:
         """
         Evict a node from the bucket.
+
+        Please note that the evicted node is replaced by the last node of the bucket (the order of the
+        nodes within the bucket does not matter).
+
         :param node: the node, or node iD, to evict.
         """
         with self.__lock_nodes.set("bucket.Bucket.remove_node"):
             identifier = node.identifier if isinstance(node, NodeData) else node
-            if not self.contains_node(identifier):
+            if identifier not in self.__shared_positions:
                 raise Exception('Unexpected node identifier "{0:d}". It should be in the k-bucket.'.format(identifier))
-            del self.__shared_nodes[identifier]
+            position = self.__shared_positions.pop(identifier)
+            last_id = self.__shared_ids.pop()
+            last_date = self.__shared_last_seen_dates.pop()
+            last_sequence = self.__shared_sequences.pop()
+            if position < len(self.__shared_ids):
+                self.__shared_ids[position] = last_id
+                self.__shared_last_seen_dates[position] = last_date
+                self.__shared_sequences[position] = last_sequence
+                self.__shared_positions[last_id] = position
 
     def get_most_recently_seen(self) -> Optional[NodeId]:
         """
@@ -85,28 +131,36 @@ class Bucket:
         contains. Otherwise, it returns the value None.
         """
         with self.__lock_nodes.set("bucket.Bucket.get_most_recently_seen"):
-            if len(self.__shared_nodes):
-                data: NodeData = sorted(self.__shared_nodes.values(), key=attrgetter('last_seen_date'))[-1]
-                return data.identifier
+            if len(self.__shared_ids):
+                dates = self.__shared_last_seen_dates
+                sequences = self.__shared_sequences
+                return self.__shared_ids[max(range(len(dates)), key=lambda i: (dates[i], sequences[i]))]
             return None
 
-    def get_least_recently_seen(self) -> Optional[NodeId]:
+    def get_least_recently_seen(self, excluded: Optional[Set[NodeId]] = None) -> Optional[NodeId]:
         """
         Return the ID of the least recently seen node from the k-bucket.
-        :return: If the k-bucket is not empty, then the method returns the ID of the least recently seen node it
-        contains. Otherwise, it returns the value None.
+        :param excluded: the IDs of the nodes that must not be considered (if any).
+        :return: If the k-bucket contains a node which ID is not excluded, then the method returns the ID of the
+        least recently seen node it contains (excluded IDs apart). Otherwise, it returns the value None.
         """
         with self.__lock_nodes.set("get_least_recently_seen"):
-            if len(self.__shared_nodes):
-                data = sorted(self.__shared_nodes.values(), key=attrgetter('last_seen_date'))[0]
-                return data.identifier
+            ids = self.__shared_ids
+            dates = self.__shared_last_seen_dates
+            sequences = self.__shared_sequences
+            positions = range(len(ids)) if not excluded else [i for i in range(len(ids)) if ids[i] not in excluded]
+            if len(positions):
+                return ids[min(positions, key=lambda i: (dates[i], sequences[i]))]
             return None
 
     def set_most_recently_seen(self, node_id: NodeId) -> None:
         with self.__lock_nodes.set("set_most_recently_seen"):
-            if node_id in self.__shared_nodes:
-                self.__shared_nodes[node_id].last_seen_date = ceil(time())
+            if node_id in self.__shared_positions:
+                position = self.__shared_positions[node_id]
+                self.__shared_last_seen_dates[position] = Clock.now()
+                self.__shared_sequences[position] = self.__shared_next_sequence
+                self.__shared_next_sequence += 1
 
     def __str__(self) -> str:
         with self.__lock_nodes.set("bucket.Bucket.__str__"):
-            return ", ".join(p.__str__() for p in self.__shared_nodes.values())
+            return ", ".join(p.__str__() for p in self.__nodes_data())
@@ -0,0 +1,35 @@
+from time import monotonic_ns
+from kad_types import Timestamp
+
+
+class Clock:
+    """
+    This class implements the clock used to date events ("last seen" dates, expiration dates of messages...).
+
+    Please note that this clock is monotonic: it is not affected by adjustments of the system clock. Thus, a date
+    returned by this clock must only be compared with another date returned by this clock.
+
+    Please note: dates are expressed in nanoseconds. A coarser resolution (such as the second) would give the same
+    date to events that happen in a row (for example, the insertion of a node into a k-bucket and a later
+    response from another node of the k-bucket). Then, the order of these events would be lost.
+    """
+
+    TICKS_PER_SECOND: int = 1000000000
+    """The number of clock ticks (nanoseconds) per second."""
+
+    @staticmethod
+    def now() -> Timestamp:
+        """
+        Return the current date.
+        :return: the current date, as an integer number of nanoseconds.
+        """
+        return Timestamp(monotonic_ns())
+
+    @staticmethod
+    def from_seconds(seconds: float) -> int:
+        """
+        Convert a duration expressed in seconds into a number of clock ticks.
+        :param seconds: the duration, in seconds.
+        :return: the duration, as an integer number of clock ticks (nanoseconds).
+        """
+        return int(seconds * Clock.TICKS_PER_SECOND)
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from loggable import Loggable
 
 
@@ -10,13 +10,17 @@ class KadConfig(Loggable):
                  k=20,
                  message_find_node_timeout: int = 3,
                  message_ping_node_timeout: int = 3,
-                 inserter_scanner_period: int = 1):
+                 inserter_scanner_period: int = 1,
+                 insertion_pool_size: Optional[int] = None,
+                 max_concurrent_pings_per_bucket: int = 1):
         self.__id_length: int = id_length
         self.__alpha: int = alpha
         self.__k: int = k
         self.__message_find_node_timeout: int = message_find_node_timeout
         self.__message_ping_node_timeout: int = message_ping_node_timeout
         self.__inserter_scanner_period: int = inserter_scanner_period
+        self.__insertion_pool_size: int = 4 * k if insertion_pool_size is None else insertion_pool_size
+        self.__max_concurrent_pings_per_bucket: int = max_concurrent_pings_per_bucket
 
     @property
     def id_length(self) -> int:
@@ -76,10 +80,36 @@ class KadConfig(Loggable):
     def inserter_scanner_period(self, value: int) -> None:
         self.__inserter_scanner_period = value
 
+    @property
+    def insertion_pool_size(self) -> int:
+        """
+        The maximum number of node IDs waiting for insertion into a (full) k-bucket. By default, this value
+        is 4 times k.
+        """
+        return self.__insertion_pool_size
+
+    @insertion_pool_size.setter
+    def insertion_pool_size(self, value: int) -> None:
+        self.__insertion_pool_size = value
+
+    @property
+    def max_concurrent_pings_per_bucket(self) -> int:
+        """
+        The maximum number of nodes from a (full) k-bucket that can be "pinged" at the same time, in order to
+        make room for the node IDs waiting for insertion. By default, this value is 1.
+        """
+        return self.__max_concurrent_pings_per_bucket
+
+    @max_concurrent_pings_per_bucket.setter
+    def max_concurrent_pings_per_bucket(self, value: int) -> None:
+        self.__max_concurrent_pings_per_bucket = value
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'log-type': 'config',
             'id_length': self.id_length,
             'alpha': self.alpha,
-            'k': self.k
+            'k': self.k,
+            'insertion_pool_size': self.insertion_pool_size,
+            'max_concurrent_pings_per_bucket': self.max_concurrent_pings_per_bucket
         }
@@ -1,7 +1,6 @@
 from typing import NewType
 
 NodeId = NewType("NodeId", int)
-BucketMask = NewType("BucketMask", int)
 BucketIndex = NewType("BucketIndex", int)
 MessageRequestId = NewType("MessageRequestId", int)
 Timestamp = NewType("Timestamp", int)
@@ -70,8 +70,18 @@ class BaseLock(object):
             self.__resource = resource
         return self
 
-    def acquire(self):
-        self.__lock.acquire()
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+        Acquire the lock (see `threading.Lock.acquire`).
+
+        Please note: the signature of this method is the one of `threading.Lock.acquire`. Thus, an instance of
+        BaseLock can be given to a `threading.Condition`.
+
+        :param blocking: flag that tells whether the call should block until the lock is acquired, or not.
+        :param timeout: the maximum number of seconds to wait for the lock (the value -1 means "no limit").
+        :return: the value True if the lock is acquired, the value False otherwise.
+        """
+        return self.__lock.acquire(blocking, timeout)
 
     def release(self):
         self.__lock.release()
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 
 class Loggable(ABC):
 
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -10,10 +10,26 @@ class Logger:
 
     __lock_fd = ExtRLock("Logger.fd")
     __shared_fd: TextIO = None
+    __trace: bool = True
 
     @staticmethod
-    def init(path: str) -> None:
+    def init(path: str, trace: bool = True) -> None:
         Logger.__shared_fd = open(path, "w")
+        Logger.__trace = trace
+
+    @staticmethod
+    def trace(fmt: str, *args) -> None:
+        """
+        Print a trace on the standard output.
+
+        Please note: the trace is formatted only if traces are enabled (see the method `init`). Thus, callers
+        should not format the trace themselves.
+
+        :param fmt: the format of the trace (see `str.format`).
+        :param args: the values to insert into the format.
+        """
+        if Logger.__trace:
+            print(fmt.format(*args))
 
     @staticmethod
     def log(message: str) -> None:
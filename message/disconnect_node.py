@@ -10,6 +10,8 @@ class DisconnectNode(Message):
     Please note that a disconnected node can be reconnected.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: int, recipient_id: NodeId, request_id: MessageRequestId):
         super().__init__(uid, request_id, MessageName.DISCONNECT_NODE, recipient_id)
 
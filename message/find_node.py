@@ -8,6 +8,8 @@ class FindNode(Message):
     This class represents a FIND_NODE message.
     """
 
+    __slots__ = ('__node_to_find_id',)
+
     def __init__(self, uid: int, sender_id: NodeId, recipient_id: NodeId, request_id: MessageRequestId,
                  node_to_find_id: NodeId):
         """
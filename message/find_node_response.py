@@ -9,6 +9,8 @@ class FindNodeResponse(Message):
     This class represents the response to a FIND_NODE message.
     """
 
+    __slots__ = ('__node_ids',)
+
     def __init__(self, uid: int, sender_id: NodeId, recipient_id: NodeId, request_id: MessageRequestId,
                  node_ids: List[NodeId]):
         self.__node_ids = node_ids
@@ -5,7 +5,7 @@ from enum import Enum
 from queue import Queue
 from queue_manager import QueueManager
 from json import dumps
-from lock import ExtLock
+from itertools import count
 from loggable import Loggable
 
 
@@ -41,9 +41,9 @@ class Message(Loggable, ABC):
     - a request ID.
     """
 
-    __lock_request_id_reference = ExtLock("Message.request_id_reference")
-    __shared_request_id_reference: int = 0
-    """Global variable used to generate unique request IDs."""
+    __shared_request_id_reference: count = count(1)
+    """Global variable used to generate unique request IDs.
+    Please note: `next` on an instance of `itertools.count` is atomic (see class Uid). Thus, no lock is required."""
     __name_enum_to_str: Dict[MessageName, str] = {
         MessageName.FIND_NODE: "FIND_NODE",
         MessageName.FIND_NODE_RESPONSE: "FIND_NODE_RESPONSE",
@@ -72,6 +72,8 @@ class Message(Loggable, ABC):
         MessageName.RECONNECT_NODE.value: MessageType.REQUEST
     }
 
+    __slots__ = ('__uid', '__request_id', '__message_name', '__recipient_id', '__sender_id', '__args')
+
     def __init__(self, uid: int, request_id: MessageRequestId, message_name: MessageName, recipient_id: NodeId,
                  sender_id: Optional[NodeId] = None, args: Optional[str] = None):
         """
@@ -98,9 +100,7 @@ class Message(Loggable, ABC):
         Generate a new unique request ID.
         :return: a new unique request ID.
         """
-        with Message.__lock_request_id_reference.set("message.message.Message.get_new_request_id"):
-            Message.__shared_request_id_reference += 1
-            return MessageRequestId(Message.__shared_request_id_reference)
+        return MessageRequestId(next(Message.__shared_request_id_reference))
 
     @staticmethod
     def name_to_type(name: str) -> MessageType:
@@ -173,8 +173,14 @@ class Message(Loggable, ABC):
         """
         return Message.__name_enum_to_type[self.__message_name]
 
-    def send(self) -> None:
-        queue: Queue = QueueManager.get_queue(self.__recipient_id)
+    def send(self, queue: Optional[Queue] = None) -> None:
+        """
+        Send the message to its recipient.
+        :param queue: the input queue of the recipient, if the caller already fetched it. If the value of this
+        parameter is None, then the queue is fetched from the queue manager.
+        """
+        if queue is None:
+            queue = QueueManager.get_queue(self.__recipient_id)
         queue.put(self)
 
     def _to_dict(self) -> Dict[str, Any]:
@@ -8,6 +8,8 @@ class PingNodeResponse(Message):
     This class represents the response to a PING message.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: int, sender_id: NodeId, recipient_id: NodeId, request_id: MessageRequestId):
         """
         Create a new PING response message.
@@ -8,6 +8,8 @@ class ReconnectNode(Message):
     Message used to tell a node to reconnect.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: int, recipient_id: NodeId, request_id: MessageRequestId):
         super().__init__(uid, request_id, MessageName.RECONNECT_NODE, recipient_id)
 
@@ -8,6 +8,8 @@ class TerminateNode(Message):
     Message used to tell a node to end its execution.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: int, recipient_id: NodeId, request_id: MessageRequestId):
         super().__init__(uid, request_id, MessageName.TERMINATE_NODE, recipient_id)
 
@@ -1,10 +1,11 @@
 from threading import Thread
-from time import sleep, time
+from time import sleep
 from typing import Dict, Tuple, List, Any, Optional, Callable
-from kad_types import MessageRequestId, Timestamp
+from kad_types import MessageRequestId, Timestamp, BucketIndex
 from abc import ABC, abstractmethod
-from message.message import Message, NodeId
-from lock import ExtLock, ExtRLock
+from message.message import Message
+from lock import ExtLock
+from clock import Clock
 
 
 class MessageSupervisor(ABC):
@@ -42,7 +43,7 @@ class MessageSupervisor(ABC):
         self.__shared_messages: Dict[MessageRequestId, Tuple[Timestamp, List[Any]]] = {}
         self.__shared_continue = True
         self.__lock_messages = ExtLock("MessageSupervisor.messages")
-        self.__lock_continue = ExtRLock("MessageSupervisor.continue")
+        self.__lock_continue = ExtLock("MessageSupervisor.continue")
         self.__start_threads()
 
     def __start_threads(self) -> None:
@@ -58,8 +59,9 @@ class MessageSupervisor(ABC):
             with self.__lock_messages.set("message_supervisor.message_supervisor.MessageSupervisor.__thread_cleaner"):
 
                 # Please note: you cannot modify the size of a dictionary while iterating it.
+                now: Timestamp = Clock.now()
                 for message_id in self.__shared_messages.keys():
-                    if self.__shared_messages[message_id][0] < time():
+                    if self.__shared_messages[message_id][0] < now:
                         to_remove.append(message_id)
 
                 for message_id in to_remove:
@@ -125,18 +127,20 @@ class MessageSupervisor(ABC):
     def add(self,
             message: Message,
             expiration_timestamp: Timestamp,
-            replacement_node_id: Optional[NodeId] = None) -> None:
+            bucket_index: Optional[BucketIndex] = None) -> None:
         """
         Place a new message under the supervisor responsibility.
         :param message: the message to supervise.
         :param expiration_timestamp: the date beyond which the message expires.
-        :param replacement_node_id: the ID of the node that should replace the pinged node in the routing table.
-        Please note that this parameter is optional.
+        :param bucket_index: the index of the k-bucket that contains the recipient of the message. Please note
+        that this parameter is optional.
         """
         pass
 
     @abstractmethod
-    def get(self, message_id: MessageRequestId, auto_remove: bool = True) -> Optional[Tuple[MessageRequestId, Optional[NodeId]]]:
+    def get(self,
+            message_id: MessageRequestId,
+            auto_remove: bool = True) -> Optional[Tuple[Message, Optional[BucketIndex]]]:
         """
         Return the message associated with a given message ID.
         :param message_id: the message ID.
@@ -145,7 +149,8 @@ class MessageSupervisor(ABC):
         the supervisor responsibility.
         :return: if the message ID is found, the method returns a tuple that contains 2 elements:
         - the message associated with a given message ID.
-        - the replacement node (please note that the value of this element may be None).
+        - the index of the k-bucket that contains the recipient of the message (please note that the value of
+          this element may be None).
         Otherwise, the method returns the value None.
         """
         pass
@@ -1,5 +1,5 @@
 from typing import Optional, Callable, Tuple
-from kad_types import MessageRequestId, NodeId, Timestamp
+from kad_types import MessageRequestId, Timestamp, BucketIndex
 from message.ping_node import PingNode
 from message_supervisor.message_supervisor import MessageSupervisor
 
@@ -35,17 +35,19 @@ class Ping(MessageSupervisor):
     def add(self,
             message: PingNode,
             expiration_timestamp: Timestamp,
-            replacement_node_id: Optional[NodeId] = None) -> None:
+            bucket_index: Optional[BucketIndex] = None) -> None:
         """
         Place a new PING message under the supervisor responsibility.
         :param message: the message to supervise.
         :param expiration_timestamp: the date beyond which the message expires.
-        :param replacement_node_id: the ID of the node that should replace the pinged node in the routing table.
-        Please note that this parameter is optional.
+        :param bucket_index: the index of the k-bucket that contains the pinged node. Please note that this
+        parameter is optional.
         """
-        super()._add(message.request_id, expiration_timestamp, [message, replacement_node_id])
+        super()._add(message.request_id, expiration_timestamp, [message, bucket_index])
 
-    def get(self, message_id: MessageRequestId, auto_remove: bool = True) -> Optional[Tuple[PingNode, Optional[NodeId]]]:
+    def get(self,
+            message_id: MessageRequestId,
+            auto_remove: bool = True) -> Optional[Tuple[PingNode, Optional[BucketIndex]]]:
         """
         Return the message associated with a given PING message ID.
         :param message_id: the message ID.
@@ -54,12 +56,11 @@ class Ping(MessageSupervisor):
         the supervisor responsibility.
         :return: if the message ID is found, the method returns a tuple that contains 2 elements:
         - the message associated with a given message ID.
-        - the replacement node (please note that the value of this element may be None).
+        - the index of the k-bucket that contains the pinged node (please note that the value of this element
+          may be None).
         Otherwise, the method returns the value None.
         """
-        # First element: the ID of the replacement node.
-        # Second element: the function to execute if the pinged node does not respond.
-        data: Optional[Tuple[PingNode, Optional[NodeId]]] = super()._get(message_id, auto_remove)
+        data: Optional[Tuple[PingNode, Optional[BucketIndex]]] = super()._get(message_id, auto_remove)
         return data
 
     def delete(self, message_id: MessageRequestId) -> None:
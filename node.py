@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Callable, List
-from threading import Thread
+from threading import Thread, Barrier
 from queue import Queue
 from kad_types import NodeId, MessageRequestId
 from node_data import NodeData
@@ -28,7 +28,8 @@ class Node:
     def __init__(self,
                  node_id: NodeId,
                  config: KadConfig,
-                 origin: Optional[NodeId] = None):
+                 origin: Optional[NodeId] = None,
+                 barrier: Optional[Barrier] = None):
         """
         Create a new Kademlia node.
         :param node_id: the ID of the node.
@@ -36,8 +37,11 @@ class Node:
         :param origin: the ID of the "origin" node. The "origin" node is the one that is used during the
         bootstrap procedure. It is a well-known node. If the current node is the "origin" node, then the
         value of this parameter is None.
+        :param barrier: an optional barrier. If specified, the node waits for all the nodes that share the
+        barrier to be running before it starts processing messages.
         """
         self.__config = config
+        self.__barrier: Optional[Barrier] = barrier
         self.__local_node_id: NodeId = node_id
         self.__is_origin: bool = origin is None
         self.__origin: Optional[NodeId] = origin
@@ -127,6 +131,8 @@ class Node:
         This method expects messages on this input queue. When a message is available,
         the method executes the suitable message handler.
         """
+        if self.__barrier is not None:
+            self.__barrier.wait()
         while True:
             print("{0:04d}> Wait for a message...".format(self.__local_node_id))
 
@@ -214,8 +220,7 @@ class Node:
         data = RoutingTableData(message.uid, self.__local_node_id, self.__routing_table.dump())
         Logger.log_data(data.to_json(), "process_find_node_response")
         # Insert the nodes into the routing table.
-        for node_id in nodes_ids:
-            self.__routing_table.add_node(node_id, message)
+        self.__routing_table.add_nodes(nodes_ids, message)
 
         # If this is the response to the initial FIND_NODE (used for bootstrap), then continue
         # the bootstrap sequence.
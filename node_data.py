@@ -4,6 +4,8 @@ from kad_types import NodeId
 
 class NodeData:
 
+    __slots__ = ('__identifier', '__last_seen_date')
+
     def __init__(self, identifier: NodeId, last_seen_date: Optional[int] = None):
         self.__identifier: NodeId = identifier
         self.__last_seen_date: Optional[int] = last_seen_date
@@ -25,7 +27,7 @@ class NodeData:
         self.__last_seen_date = timestamp
 
     def to_str(self, id_length) -> str:
-        return ('(0xb{0:0%db}, {1:d})' % id_length).format(self.__identifier, self.__last_seen_date)
+        return f'(0xb{self.__identifier:0{id_length}b}, {self.__last_seen_date:d})'
 
     def __str__(self) -> str:
         return '(0x{0:b}, {1:d})'.format(self.__identifier, self.__last_seen_date)
@@ -1,22 +1,22 @@
-from typing import Tuple, List, Optional, Dict, Pattern, Match, Any
+from typing import Tuple, List, Optional, Dict, Set, Pattern, Match, Any
 import re
-from random import randint
-from math import floor, ceil
-from time import time, sleep
-from threading import Thread
+from random import getrandbits
+from heapq import nsmallest
+from threading import Thread, Condition
 from kad_config import KadConfig
-from bucket import Bucket
+from bucket import Bucket, BucketAddResult
 from node_data import NodeData
-from kad_types import NodeId, BucketMask, BucketIndex, MessageRequestId, Timestamp
+from kad_types import NodeId, BucketIndex, MessageRequestId, Timestamp
 from message.message import Message, MessageAction
 from message.ping_node import PingNode
 from message.ping_node_reponse import PingNodeResponse
 from message_supervisor.ping import Ping as PingSupervisor
 from uid import Uid
+from clock import Clock
 from queue_manager import QueueManager
 from queue import Queue
 from logger import Logger
-from lock import ExtRLock
+from lock import ExtLock
 from loggable import Loggable
 
 
@@ -50,45 +50,124 @@ class RoutingTable(Loggable):
                 - if the (new) node ID is already present in the k-bucket FIFO, then the node ID is not inserted
                   (twice) into the FIFO. Otherwise, the (new) node ID is inserted into the FIFO. This takes care
                   of (2).
-                - only one node from a given k-bucket is "pinged" at a time. From another point of view (the FIFO
-                  point of view): node IDs in a k-bucket FIFO are processed one after the other. This takes care
-                  of (1).
-
-                Note: the order of the node IDs within k-bucket FIFOs does not matter. Thus, instead of FIFOs, we
-                used dictionaries to store node IDs (because the only thing that matters is to be able to determine
-                whether a given node ID has already been scheduled for "possible" insertion into the k-bucket).
+                - only a limited number of nodes from a given k-bucket are "pinged" at a time (see the configuration
+                  parameter "max_concurrent_pings_per_bucket", which default value is 1). And a node is never
+                  "pinged" twice at the same time. From another point of view (the FIFO point of view): node IDs in
+                  a k-bucket FIFO are processed a few at a time. This takes care of (1).
+
+                Note: instead of FIFOs, we use dictionaries to store node IDs (dictionaries keep the insertion
+                order, and they let us determine whether a given node ID has already been scheduled for "possible"
+                insertion into the k-bucket).
+
+                Note: the pools are "replacement caches". A pool contains a bounded number of node IDs (see the
+                configuration parameter "insertion_pool_size"), sorted by "last seen" date (the most recently seen
+                node ID is the last one). When a pool is full, the least recently seen node ID is dropped. When
+                a node of the k-bucket is found stale, the most recently seen node ID of the pool replaces it.
+                When a "pinged" node responds, the node IDs that were in the pool when the PING was sent are
+                dropped (the k-bucket has no room for them). Thus, a k-bucket which nodes respond is not "pinged"
+                again until new node IDs are discovered. Furthermore, the nodes of a given k-bucket are not
+                "pinged" more than once per PING timeout.
     """
 
+    __slots__ = ('__config', '__identifier', '__id_length', '__id_mask', '__bucket_bases', '__repr_header',
+                 '__ping_supervisor',
+                 '__shared_buckets', '__shared_insertion_pools', '__shared_last_ping_dates', '__shared_pinged_nodes',
+                 '__shared_ping_round_candidates',
+                 '__shared_continue', '__shared_node_to_bucket', '__shared_nonempty_buckets',
+                 '__shared_repr_cache', '__shared_dump_cache', '__shared_repr_version', '__shared_dump_version',
+                 '__shared_pending_buckets',
+                 '__lock_buckets', '__lock_caches', '__lock_continue', '__lock_pending_buckets',
+                 '__lock_nonempty_buckets',
+                 '__condition_pending_buckets')
+
     def __init__(self, identifier: NodeId, config: KadConfig):
         self.__config = config
         self.__identifier = identifier
         """This local node ID."""
-        self.__shared_buckets: Tuple[Bucket, ...] = tuple(Bucket(config.k) for _ in range(config.id_length))
-        """The k-buckets."""
+        self.__id_length: int = config.id_length
+        """The length of a node ID, in bits. This is also the number of k-buckets."""
+        self.__shared_buckets: Dict[BucketIndex, Bucket] = {}
+        """The k-buckets, indexed by their index values. Please note: a k-bucket is only created the first time a
+        node is inserted into it (in practice, most k-buckets remain empty). Once created, a k-bucket is never
+        deleted."""
         self.__shared_insertion_pools: Tuple[Dict[NodeId, MessageRequestId], ...] = tuple({} for _ in range(config.id_length))
-        """The pools used to store node IDs waiting for being inserted into the k-buckets.
+        """The pools used to store node IDs waiting for being inserted into the k-buckets (the replacement caches).
         Please note: the message request ID is the request ID of the message that triggered the node ID insertion.
         The message request ID is used for logging purpose only!"""
-        self.__shared_insertion_pools_busy_flags: List[bool] = list(False for _ in range(config.id_length))
-        """This property associates a "busy flag" for each insertion pool. If the value if the "busy flag"
-        is True, it means that that one node ID from the pool is being processed (for potential insertion
-        into the appropriate k-bucket). """
-        self.__bucket_masks: Tuple[BucketMask] = self.__init_bucket_masks()
+        self.__shared_last_ping_dates: List[Optional[Timestamp]] = list(None for _ in range(config.id_length))
+        """For each k-bucket, the date of the last PING sent to one of its nodes in order to make room for a
+        node ID waiting in the insertion pool. The value None means that no PING has been sent yet."""
+        self.__shared_pinged_nodes: Tuple[Set[NodeId], ...] = tuple(set() for _ in range(config.id_length))
+        """For each k-bucket, the IDs of the nodes that have been "pinged" and which responses are expected. Each
+        one of these PINGs may result in the insertion of one node ID from the insertion pool into the k-bucket.
+        Please note: the number of elements in a set is limited by the configuration parameter
+        "max_concurrent_pings_per_bucket"."""
+        self.__shared_ping_round_candidates: List[Set[NodeId]] = list(set() for _ in range(config.id_length))
+        """For each k-bucket, the node IDs that were in the insertion pool when the nodes of the k-bucket were last
+        "pinged". These node IDs are dropped from the pool if a "pinged" node responds."""
+        self.__repr_header: List[str] = [f'RT for {identifier:0{config.id_length}b}', '  Bucket masks:']
+        # Please note: the mask of the bucket at index I is (local_node_id >> I) xor 1.
+        self.__repr_header.extend(f"    {i:3d}: {(identifier >> i) ^ 1:0{config.id_length - i}b}{'.' * i} "
+                                  f"(test if ((id >> {i:03d}) ^ mask) == 0)" for i in range(config.id_length))
+        """The first lines of the textual representation of the routing table (see `__repr__`). These lines
+        never change. Thus, they are built once for all."""
+        self.__id_mask: int = (1 << config.id_length) - 1
+        """The mask that selects the bits of a node ID (all bits are set to 1)."""
+        self.__bucket_bases: Tuple[NodeId, ...] = tuple(
+            NodeId((identifier ^ (1 << i)) & ~((1 << i) - 1) & self.__id_mask) for i in range(config.id_length))
+        """For each bucket, the smallest node ID that belongs to the bucket (see the method
+        `get_random_node_id_within_bucket`)."""
         self.__ping_supervisor = PingSupervisor(self.__thread_ping_no_response)
         """This component periodically checks the status of the PING requests: have they received responses ?"""
         self.__shared_continue = True
-        self.__lock_buckets = ExtRLock("RoutingTable.buckets")
-        self.__lock_continue = ExtRLock("RoutingTable.continue")
+        self.__shared_node_to_bucket: Dict[NodeId, BucketIndex] = {}
+        """This property associates the ID of a node stored in a k-bucket with the index of this k-bucket."""
+        self.__shared_nonempty_buckets: Set[BucketIndex] = set()
+        """The indexes of the k-buckets that contain at least one node. Please note that, in practice, most
+        k-buckets are empty. Please note: the k-buckets which indexes are in this set have been created."""
+        self.__shared_repr_cache: Optional[str] = None
+        """The textual representation of the routing table returned by `__repr__`. The value None means that
+        the k-buckets changed since the last time the representation was built."""
+        self.__shared_dump_cache: Optional[str] = None
+        """The dump of the routing table returned by `dump`. The value None means that the content of the
+        k-buckets changed since the last time the dump was built."""
+        self.__shared_repr_version: int = 0
+        """This counter is incremented each time the textual representation of the routing table is reset. It is
+        used to detect that the k-buckets changed while the representation was being built."""
+        self.__shared_dump_version: int = 0
+        """This counter is incremented each time the dump of the routing table is reset. It is used to detect
+        that the content of the k-buckets changed while the dump was being built."""
+        self.__lock_buckets: Tuple[ExtLock, ...] = tuple(ExtLock("RoutingTable.buckets[{0:d}]".format(i))
+                                                         for i in range(config.id_length))
+        """One lock per k-bucket. The lock at index I synchronizes the access to the k-bucket at index I, to
+        its insertion pool and to its set of "pinged" nodes. Thus, operations on distinct k-buckets don't block each
+        other. Please note: these locks are not reentrant."""
+        self.__lock_nonempty_buckets = ExtLock("RoutingTable.nonempty_buckets")
+        """This lock synchronizes the access to the set of non-empty k-buckets. The set is modified while holding
+        the lock that synchronizes the access to a k-bucket, and it is copied by the methods that visit all the
+        k-buckets (see `__get_nonempty_buckets`). Please note: this lock may be acquired while holding the lock
+        that synchronizes the access to a k-bucket (never the other way around)."""
+        self.__lock_caches = ExtLock("RoutingTable.caches")
+        """This lock synchronizes the access to the cached representations of the routing table."""
+        self.__lock_continue = ExtLock("RoutingTable.continue")
+        self.__shared_pending_buckets: Set[BucketIndex] = set()
+        """The indexes of the k-buckets which insertion pools may need to be processed by the inserter thread."""
+        self.__lock_pending_buckets = ExtLock("RoutingTable.pending_buckets")
+        self.__condition_pending_buckets = Condition(self.__lock_pending_buckets)
+        """This condition is notified whenever a k-bucket index is added to the set of pending k-buckets (or when
+        the routing table is stopped). Please note: the lock that synchronizes the access to the set of pending
+        k-buckets may be acquired while holding the lock that synchronizes the access to a k-bucket (never the
+        other way around)."""
         self.__start_threads()
 
     def __start_threads(self) -> None:
         Thread(target=self.__thread_inserter).start()
 
-    def __thread_ping_no_response(self, message: PingNode, replacement_node_id: NodeId) -> None:
+    def __thread_ping_no_response(self, message: PingNode, bucket_id: Optional[BucketIndex] = None) -> None:
         """
         Treat the absence of (PING) response from a node. Please note that if a node failed to respond to a PING,
-        then it is evicted from the k-bucket and it is replaced by the most recently seen node (that is, the node
-        we just learned about).
+        then it is evicted from the k-bucket and it is replaced by the most recently seen node ID of the insertion
+        pool associated with the k-bucket.
 
         Please note:
         - the method will be executed by the PING supervisor.
@@ -96,54 +175,166 @@ class RoutingTable(Loggable):
 
         :param message: the PING message. Please keep in mind that this message is the one that has been sent by
         the local node! This is **NOT** a received message. Thus, the node to evict is the target node!
-        :param replacement_node_id: the ID of the node that must be used to replace the node that does not respond
-        to the PING. Please note that this is "the node we just learned about".
+        :param bucket_id: the index of the k-bucket that contains the node that does not respond. If this
+        parameter is not specified, then the method will find out the bucket index.
         """
-        print("{0:04d}> Execute the callback function for PING messages that did not receive a response: "
-              "{1:s}. Replacement node: {2:d}".format(self.identifier, message.to_str(), replacement_node_id))
+        Logger.trace("{0:04d}> Execute the callback function for PING messages that did not receive a response: "
+                     "{1:s}.", self.__identifier, message.to_str())
 
         # Please keep in mind that this message is the one that has been sent by the local node! This is
         # **NOT** a received message. Thus, the node to evict is the target node!
 
+        # Please note: the node to evict and its replacement belong to the same k-bucket.
         node_to_evict: NodeId = message.recipient
-        with self.__lock_buckets.set("__thread_ping_no_response"):
-            self.__evict_node(node_to_evict)
-            self.add_node(replacement_node_id)
+        if bucket_id is None:
             bucket_id = self.__find_bucket_index(node_to_evict)
-            self.__shared_insertion_pools_busy_flags[bucket_id] = False
+        with self.__lock_buckets[bucket_id].set("routing_table.RoutingTable.__thread_ping_no_response"):
+            self.__replace_node(node_to_evict, bucket_id)
+
+    def __replace_node(self, node_id: NodeId, bucket_id: BucketIndex) -> None:
+        """
+        Evict a (stale) node from a k-bucket and replace it (see the method `__thread_ping_no_response`).
+
+        WARNING: precautions must be taken while calling this function!
+                 You must acquire the lock that synchronizes the access to the k-bucket (identified by the
+                 given index) prior to calling the method.
+
+        :param node_id: the ID of the node to evict.
+        :param bucket_id: the index of the k-bucket that contains the node.
+        """
+        self.__evict_node(node_id, bucket_id)
+        pool: Dict[NodeId, MessageRequestId] = self.__shared_insertion_pools[bucket_id]
+        if len(pool):
+            # Take the most recently seen node ID (popitem() removes the last inserted item).
+            replacement_node_id, _ = pool.popitem()
+            self.__add_node(replacement_node_id, bucket_id, None, Clock.now())
+        self.__shared_pinged_nodes[bucket_id].discard(node_id)
+        if len(pool):
+            self.__schedule_bucket(bucket_id)
 
     def __thread_inserter(self) -> None:
         """
-        Periodically scans the insertion queues in order to find nodes that are waiting for
-        potential insertion into k-buckets.
+        Process the insertion queues in order to find nodes that are waiting for potential insertion into
+        k-buckets.
+
+        Please note: the thread does not scan all the insertion queues periodically. It waits until k-buckets are
+        declared "pending" (see the method `__schedule_bucket`), and it only processes these k-buckets. However,
+        the k-buckets which nodes have been "pinged" recently are processed again after a delay (defined by the
+        configuration parameter "inserter_scanner_period").
         """
+        ping_timeout: int = Clock.from_seconds(self.__config.message_ping_node_timeout)
+        max_pings: int = self.__config.max_concurrent_pings_per_bucket
+        deferred: Set[BucketIndex] = set()
         while True:
-            with self.__lock_buckets.set("routing_table.RoutingTable.__thread_inserter"):
-                bucket_id: BucketIndex
-                for bucket_id in range(len(self.__shared_insertion_pools)):
-                    if self.__shared_insertion_pools_busy_flags[bucket_id]:
-                        # One node ID from the insertion pool associated with the current k-bucket is being
-                        # processed for potential injection.
+            with self.__lock_pending_buckets.set("routing_table.RoutingTable.__thread_inserter"):
+                # Please note: the flag is tested while holding the lock used by the condition. Thus, the
+                # notification sent by the method `stop` cannot be missed.
+                with self.__lock_continue.set("routing_table.RoutingTable.__thread_inserter"):
+                    if not self.__shared_continue:
+                        break
+                if not len(self.__shared_pending_buckets):
+                    self.__condition_pending_buckets.wait(self.__config.inserter_scanner_period if len(deferred)
+                                                          else None)
+                bucket_ids: Set[BucketIndex] = self.__shared_pending_buckets
+                self.__shared_pending_buckets = set()
+            bucket_ids |= deferred
+            deferred = set()
+
+            now: Timestamp = Clock.now()
+            bucket_id: BucketIndex
+            for bucket_id in bucket_ids:
+                with self.__lock_buckets[bucket_id].set("routing_table.RoutingTable.__thread_inserter"):
+                    pinged: Set[NodeId] = self.__shared_pinged_nodes[bucket_id]
+                    if len(pinged) >= max_pings:
+                        # The maximum number of node IDs from the insertion pool associated with the current
+                        # k-bucket are being processed for potential injection. The k-bucket will be declared
+                        # "pending" again when a processing is done.
+                        continue
+                    last_ping_date: Optional[Timestamp] = self.__shared_last_ping_dates[bucket_id]
+                    if last_ping_date is not None and now < last_ping_date + ping_timeout:
+                        # A node of the k-bucket has been "pinged" recently: try again later.
+                        deferred.add(bucket_id)
                         continue
                     pool: Dict[NodeId, MessageRequestId] = self.__shared_insertion_pools[bucket_id]
-                    if len(pool):
-                        # Pop an item chosen at random.
-                        node_id, request_id = list(pool.items()).pop()
+                    # Please note: each PING may result in the insertion of one node ID from the pool. Thus,
+                    # there is no point in sending more PINGs than there are node IDs in the pool.
+                    if len(pinged) < min(max_pings, len(pool)):
+                        self.__shared_ping_round_candidates[bucket_id] = set(pool)
+                    while len(pinged) < min(max_pings, len(pool)):
+                        # Pick the most recently seen node ID (dictionaries keep the insertion order).
+                        # Please note: the node ID stays in the pool. It is removed when the PING is processed.
+                        _, request_id = next(reversed(pool.items()))
                         # Ping the least recently seen node from the k-bucket (and, eventually, replace it).
-                        self.__shared_insertion_pools_busy_flags[bucket_id] = True
-                        self.__ping_for_replacement(bucket_id, node_id, request_id)
+                        self.__shared_last_ping_dates[bucket_id] = now
+                        if not self.__ping_for_replacement(bucket_id, request_id, now):
+                            break
+
+    def __schedule_bucket(self, bucket_id: BucketIndex) -> None:
+        """
+        Declare a k-bucket as "pending": its insertion pool needs to be processed by the inserter thread.
+        :param bucket_id: the index of the k-bucket.
+        """
+        with self.__lock_pending_buckets.set("routing_table.RoutingTable.__schedule_bucket"):
+            self.__shared_pending_buckets.add(bucket_id)
+            self.__condition_pending_buckets.notify()
+
+    def __set_bucket_insertion_pool_as_available(self, bucket_id: BucketIndex, node_id: NodeId) -> None:
+        """
+        Declare that a "pinged" node responded. The node IDs that were in the insertion pool when the node was
+        "pinged" are dropped: the k-bucket has no room for them.
+        :param bucket_id: the index of the k-bucket that contains the node.
+        :param node_id: the ID of the node.
+        """
+        with self.__lock_buckets[bucket_id].set("routing_table.RoutingTable.__set_bucket_insertion_pool_as_available"):
+            self.__shared_pinged_nodes[bucket_id].discard(node_id)
+            pool: Dict[NodeId, MessageRequestId] = self.__shared_insertion_pools[bucket_id]
+            for candidate_id in self.__shared_ping_round_candidates[bucket_id]:
+                pool.pop(candidate_id, None)
+            self.__shared_ping_round_candidates[bucket_id].clear()
+            if len(pool):
+                self.__schedule_bucket(bucket_id)
+
+    def __reset_caches(self, reset_dump: bool = True) -> None:
+        """
+        Reset the cached representations of the routing table. This method must be called after the content of
+        a k-bucket changed.
 
-            sleep(self.__config.inserter_scanner_period)
-            with self.__lock_continue.set("routing_table.RoutingTable.__thread_inserter"):
-                if not self.__shared_continue:
-                    break
+        Please note: the lock that synchronizes the access to the caches is always acquired after the lock
+        that synchronizes the access to a k-bucket (never the other way around).
 
-    def __set_bucket_insertion_pool_as_available(self, bucket_id: BucketIndex) -> None:
-        self.__shared_insertion_pools_busy_flags[bucket_id] = False
+        :param reset_dump: flag that tells whether the dump must be reset or not. The dump does not contain the
+        "last seen" dates. Thus, it does not need to be reset when only a "last seen" date changed.
+        """
+        with self.__lock_caches.set("routing_table.RoutingTable.__reset_caches"):
+            self.__shared_repr_cache = None
+            self.__shared_repr_version += 1
+            if reset_dump:
+                self.__shared_dump_cache = None
+                self.__shared_dump_version += 1
 
-    def __init_bucket_masks(self) -> Tuple[BucketMask]:
+    @property
+    def identifier(self) -> NodeId:
         """
-        Calculate the masks used to find the bucket associated to a given node.
+        Return the ID of the node that owns this routing table (that is: the ID of the local node).
+
+        :return: the ID of the node that owns this routing table.
+        """
+        # Please note: the value "self.__identifier" is set once for all during the node creation.
+        # And then its value is never modified. Thus, access to this property does not need to be
+        # synchronized.
+        return self.__identifier
+
+    def __find_bucket_index(self, identifier: NodeId) -> Optional[BucketIndex]:
+        """
+        Find the bucket where to store a given node ID.
+
+        Please note: if L is the length of a node ID (in bits), then a bucket index value is between
+        0 to L-1 (included).
+
+        Please note: the index of the bucket is the position of the most significant bit that differs between
+        the given node ID and the local node ID. That is: floor(log2(identifier XOR local_node_id)). This is
+        equivalent to testing "bucket masks" one after the other: the node ID belongs to the bucket at index I if
+        ((ID >> I) xor maskI) is 0, with maskI = (local_node_id >> I) xor 1.
 
         Please note that these masks depends on the local node.
 
@@ -190,40 +381,19 @@ class RoutingTable(Loggable):
         6             | 01......
         7             | 1.......
 
-        :return: the list of bucket masks.
-        """
-        return tuple(BucketMask((self.__identifier >> i) ^ 1) for i in range(self.__config.id_length))
-
-    @property
-    def identifier(self) -> NodeId:
-        """
-        Return the ID of the node that owns this routing table (that is: the ID of the local node).
-
-        :return: the ID of the node that owns this routing table.
-        """
-        # Please note: the value "self.__identifier" is set once for all during the node creation.
-        # And then its value is never modified. Thus, access to this property does not need to be
-        # synchronized.
-        return self.__identifier
-
-    def __find_bucket_index(self, identifier: NodeId) -> Optional[BucketIndex]:
-        """
-        Find the bucket where to store a given node ID.
-
-        Please note: if L is the length of a node ID (in bits), then a bucket index value is between
-        0 to L-1 (included).
+        Please note: this method only uses values that are set once for all during the creation of the routing
+        table (the local node ID). Thus, it does not need to be synchronized, and it can be called whether a
+        lock that synchronizes the access to a k-bucket is held or not.
 
         :param identifier: the node ID.
         :return: if a bucket is found, then the method returns its index value. Otherwise it returns
         the value None. Please note that the only node ID that cannot be stored into a bucket is the
         ID of the local node.
         """
-        index: Optional[BucketIndex] = None
-        for i in range(self.__config.id_length):
-            if not ((identifier >> i) ^ self.__bucket_masks[i]):
-                index = BucketIndex(i)
-                break
-        return index
+        distance = identifier ^ self.__identifier
+        if not distance:
+            return None
+        return BucketIndex(distance.bit_length() - 1)
 
     def add_node(self, node_id: NodeId, message: Optional[Message] = None) -> None:
         """
@@ -256,40 +426,127 @@ class RoutingTable(Loggable):
         # Please note: the returned value (bucket_index) is greater than or equal to zero.
         # Indeed, the only node that cannot be added to the routing table is the local peer.
         # Yet, this case has already been handled.
-        with self.__lock_buckets.set("routing_table.RoutingTable.add_node"):
-            bucket_index = self.__find_bucket_index(node_id)
-            added, already_in = self.__shared_buckets[bucket_index].add_node(NodeData(node_id, last_seen_date=floor(time())))
+        bucket_index = self.__find_bucket_index(node_id)
+        # Please note: the "last seen" date is an integer number of seconds.
+        last_seen_date = Clock.now()
+        with self.__lock_buckets[bucket_index].set("routing_table.RoutingTable.add_node"):
+            self.__add_node(node_id, bucket_index, message, last_seen_date)
 
-            if message is None:
-                # The only time we go through this branch is when the well-known "origin" node is inserted.
-                # In this case, the routing table is empty since this node is the first to be inserted.
-                return
+    def add_nodes(self, node_ids: List[NodeId], message: Message) -> None:
+        """
+        Add a list of nodes to the routing table.
+
+        This method is equivalent to calling the method `add_node` for each node. However, the nodes are
+        grouped by k-bucket, so that the lock that synchronizes the access to a k-bucket is acquired only once
+        per k-bucket. And all the nodes that are inserted into k-buckets get the same "last seen" date.
+
+        :param node_ids: the IDs of the nodes to add. Please note that these nodes must not be the local node!
+        :param message: the message that triggered the request (typically, a response to a FIND_NODE message).
+        :raise Exception: if one of the given nodes is the local node. In this case, no node is added.
+        """
+        nodes_by_bucket: Dict[BucketIndex, List[NodeId]] = {}
+        for node_id in node_ids:
+            if node_id == self.__identifier:
+                raise Exception("The local node {0:d} should not be inserted into the routing "
+                                "table.".format(node_id))
+            nodes_by_bucket.setdefault(self.__find_bucket_index(node_id), []).append(node_id)
+        last_seen_date = Clock.now()
+        for bucket_index, bucket_node_ids in nodes_by_bucket.items():
+            with self.__lock_buckets[bucket_index].set("routing_table.RoutingTable.add_nodes"):
+                for node_id in bucket_node_ids:
+                    self.__add_node(node_id, bucket_index, message, last_seen_date)
+
+    def __add_node(self,
+                   node_id: NodeId,
+                   bucket_index: BucketIndex,
+                   message: Optional[Message],
+                   last_seen_date: int) -> None:
+        """
+        Add a node to the routing table (see the method `add_node`).
+
+        WARNING: precautions must be taken while calling this function!
+                 You must acquire the lock that synchronizes the access to the k-bucket (identified by the
+                 given index) prior to calling the method.
+
+        :param node_id: the ID of the node to add. Please note that this node must not be the local node!
+        :param bucket_index: the index of the k-bucket that would be used to store the node.
+        :param message: the message that triggered the request, if any.
+        :param last_seen_date: the "last seen" date of the node, if it is inserted into a k-bucket.
+        """
+        bucket: Optional[Bucket] = self.__shared_buckets.get(bucket_index)
+        if bucket is None:
+            bucket = self.__shared_buckets[bucket_index] = Bucket(self.__config.k)
+        result = bucket.add_node(NodeData(node_id, last_seen_date=last_seen_date))
+        if result is BucketAddResult.ADDED:
+            self.__shared_node_to_bucket[node_id] = bucket_index
+            with self.__lock_nonempty_buckets.set("routing_table.RoutingTable.__add_node"):
+                self.__shared_nonempty_buckets.add(bucket_index)
+            self.__reset_caches()
+            return
 
-            # We may need to add the node ID to the appropriate insertion queue.
-            if not added and not already_in:
-                if node_id not in self.__shared_insertion_pools[bucket_index]:
-                    self.__shared_insertion_pools[bucket_index][node_id] = message.request_id
+        if result is BucketAddResult.ALREADY_IN or message is None:
+            # We go through this branch (with message set to None) when the well-known "origin" node is inserted
+            # (in this case, the routing table is empty since this node is the first to be inserted), or when a
+            # node from an insertion pool replaces a stale node (in this case, there is room for the node in the
+            # k-bucket).
+            return
+
+        # The k-bucket is full: add the node ID to the appropriate insertion queue.
+        # Please note: the most recently seen node ID is the last one in the insertion pool. Thus, if the
+        # node ID is already in the pool, then it is moved to the end of the pool.
+        pool: Dict[NodeId, MessageRequestId] = self.__shared_insertion_pools[bucket_index]
+        pool.pop(node_id, None)
+        pool[node_id] = message.request_id
+        if len(pool) > self.__config.insertion_pool_size:
+            # Drop the least recently seen node ID.
+            del pool[next(iter(pool))]
+        self.__schedule_bucket(bucket_index)
 
     def find_closest(self, node_id: NodeId, count: int) -> List[NodeId]:
         """
         Find the closest nodes to a given node.
 
-        NOTE: this function accesses the k-buckets. But it takes care of the synchronisation.
+        NOTE: this function accesses the k-buckets. But it takes care of the synchronisation: the methods of
+              class Bucket are synchronized, and the function only reads the k-buckets. Thus, it does not need
+              to acquire the lock that synchronizes the access to the k-buckets. The set of non-empty k-buckets
+              is copied while holding its own lock.
+
+        Please note: the k-buckets are not all scanned. Let D be the distance between the given node ID and the
+        local node ID (D = node_id XOR local_node_id). The distances between the given node ID and the node IDs
+        stored in the k-bucket at index I all share the same prefix: P(I) = ((D XOR 2^I) >> I) << I (the I
+        lowest bits are free). Thus, all the nodes stored in the k-bucket at index I are closer to the given
+        node than all the nodes stored in the k-bucket at index J if P(I) < P(J). The k-buckets are visited by
+        increasing value of P, and the visit stops as soon as enough nodes have been found.
 
         :param node_id: the ID of the node.
         :param count: the maximum number of node IDs to return.
         :return: the list of node IDs that are the closest ones to the given one.
         """
-        with self.__lock_buckets.set("routing_table.RoutingTable.find_closest"):
-            ids: List[NodeId] = []
-            for bucket in self.__shared_buckets:
-                ids.extend(bucket.get_all_nodes_ids())
-            return sorted(ids, key=lambda pid: node_id ^ pid)[0: count]
+        distance = node_id ^ self.__identifier
+        # Please note: the bound method "node_id.__xor__" is implemented in C. Using it as a sort key avoids
+        # executing a Python function (lambda pid: node_id ^ pid) for every node ID.
+        xor = node_id.__xor__
+        closest: List[NodeId] = []
+        for bucket_index in sorted(self.__get_nonempty_buckets(), key=lambda i: ((distance ^ (1 << i)) >> i) << i):
+            if len(closest) >= count:
+                break
+            ids: List[NodeId] = self.__shared_buckets[bucket_index].get_all_nodes_ids()
+            closest.extend(nsmallest(count - len(closest), ids, key=xor))
+        return closest
+
+    def __get_nonempty_buckets(self) -> Tuple[BucketIndex, ...]:
+        """
+        Return a copy of the set of non-empty k-buckets. Please note that the k-buckets may change while the copy is
+        being visited (a k-bucket may become empty, for example).
+        :return: the indexes of the non-empty k-buckets.
+        """
+        with self.__lock_nonempty_buckets.set("routing_table.RoutingTable.__get_nonempty_buckets"):
+            return tuple(self.__shared_nonempty_buckets)
 
-    def __get_least_recently_seen(self, bucket_id: int) -> Optional[NodeId]:
+    def __get_least_recently_seen(self, bucket_id: int, excluded: Optional[Set[NodeId]] = None) -> Optional[NodeId]:
         # The methods of class Bucket are synchronized.
-        bucket: Bucket = self.__shared_buckets[bucket_id]
-        return bucket.get_least_recently_seen()
+        bucket: Optional[Bucket] = self.__shared_buckets.get(bucket_id)
+        return None if bucket is None else bucket.get_least_recently_seen(excluded)
 
     def __set_most_recently_seen(self, node_id: NodeId, bucket_idx: Optional[int] = None) -> None:
         """
@@ -299,28 +556,46 @@ class RoutingTable(Loggable):
         :param bucket_idx: the index of the bucket that contains the node.
         If this parameter is not specified, then the method will find out the bucket index.
         """
-        with self.__lock_buckets.set("routing_table.RoutingTable.__set_most_recently_seen"):
+        if bucket_idx is None:
+            bucket_idx = self.__shared_node_to_bucket.get(node_id)
             if bucket_idx is None:
-                bucket_idx = self.__find_bucket_index(node_id)
-            bucket: Bucket = self.__shared_buckets[bucket_idx]
+                # The node is not in the routing table.
+                return
+        with self.__lock_buckets[bucket_idx].set("routing_table.RoutingTable.__set_most_recently_seen"):
+            bucket: Optional[Bucket] = self.__shared_buckets.get(bucket_idx)
+            if bucket is None:
+                # The node is not in the routing table.
+                return
             bucket.set_most_recently_seen(node_id)
+        # The "last seen" dates do not appear in the dump.
+        self.__reset_caches(reset_dump=False)
 
     def __evict_node(self, node_id: NodeId, bucket_idx: Optional[int] = None) -> None:
         """
         Evict a node from a bucket.
 
         WARNING: precautions must be taken while calling this function!
-                 You must acquire the lock that synchronizes the access to the k-buckets prior
-                 to calling the method.
+                 You must acquire the lock that synchronizes the access to the k-bucket that contains the
+                 node prior to calling the method.
 
         :param node_id: The ID of the node to evict.
         :param bucket_idx: the index of the bucket that contains the node.
         If this parameter is not specified, then the method will find out the bucket index.
         """
         if bucket_idx is None:
-            bucket_idx = self.__find_bucket_index(node_id)
-        bucket: Bucket = self.__shared_buckets[bucket_idx]
+            bucket_idx = self.__shared_node_to_bucket.get(node_id)
+            if bucket_idx is None:
+                # The node is not in the routing table: the bucket will raise an exception.
+                bucket_idx = self.__find_bucket_index(node_id)
+        bucket: Optional[Bucket] = self.__shared_buckets.get(bucket_idx)
+        if bucket is None:
+            raise Exception('Unexpected node identifier "{0:d}". It should be in the k-bucket.'.format(node_id))
         bucket.remove_node(node_id)
+        del self.__shared_node_to_bucket[node_id]
+        if not bucket.count():
+            with self.__lock_nonempty_buckets.set("routing_table.RoutingTable.__evict_node"):
+                self.__shared_nonempty_buckets.discard(bucket_idx)
+        self.__reset_caches()
 
     def get_random_node_id_within_bucket(self, bucket_index: BucketIndex) -> NodeId:
         """
@@ -354,13 +629,10 @@ class RoutingTable(Loggable):
         :param bucket_index: the bucket index.
         :return: a node ID that belongs to this bucket identifier by the given index.
         """
-        if bucket_index not in range(0, self.__config.id_length):
+        if not 0 <= bucket_index < self.__id_length:
             raise Exception("Unexpected bucket index {0:d}.".format(bucket_index))
-        maximum = pow(2, self.__config.id_length) - 1
-        v = (self.__bucket_masks[bucket_index] << bucket_index) & maximum
-        for i in range(0, bucket_index):
-            v = v | (randint(0, 1) << i)
-        return v
+        # Please note: the call to getrandbits(0) is valid (and it returns 0).
+        return NodeId(self.__bucket_bases[bucket_index] | getrandbits(bucket_index))
 
     def stop(self) -> None:
         """
@@ -368,6 +640,9 @@ class RoutingTable(Loggable):
         """
         with self.__lock_continue.set("routing_table.RoutingTable.stop"):
             self.__shared_continue = False
+        # Wake up the inserter thread.
+        with self.__lock_pending_buckets.set("routing_table.RoutingTable.stop"):
+            self.__condition_pending_buckets.notify()
         self.__ping_supervisor.stop()
 
     def notify_ping_response(self, message: PingNodeResponse) -> None:
@@ -379,32 +654,54 @@ class RoutingTable(Loggable):
 
         :param message: the message that contains the response for the PING message.
         """
-        self.__ping_supervisor.delete(message.request_id)
-        bucket_id = self.__find_bucket_index(message.sender_id)
+        data: Optional[Tuple[PingNode, Optional[BucketIndex]]] = self.__ping_supervisor.get(message.request_id)
+        if data is None:
+            # The PING already expired (the response came too late): the node has been processed as a node that
+            # does not respond, and it has been removed from the set of "pinged" nodes. Please note that the node
+            # may now be "pinged" again: it must not be removed from the set.
+            self.__set_most_recently_seen(message.sender_id)
+            return
+        bucket_id: Optional[BucketIndex] = data[1]
+        if bucket_id is None:
+            bucket_id = self.__find_bucket_index(message.sender_id)
         self.__set_most_recently_seen(message.sender_id, bucket_id)
-        self.__set_bucket_insertion_pool_as_available(bucket_id)
+        self.__set_bucket_insertion_pool_as_available(bucket_id, message.sender_id)
 
     def __ping_for_replacement(self,
                                bucket_idx: int,
-                               new_node_to_insert_id: NodeId,
-                               message_request_id: MessageRequestId) -> None:
+                               message_request_id: MessageRequestId,
+                               now: Timestamp) -> bool:
         """
         Ping a node in the context when we try to insert a new node into a full bucket.
         In this context, the procedure is the following:
 
         We ping the least recently seen node in the bucket.
         * if the least recently seen node fails to respond to the PING message, then we evict it from
-          the bucket and we insert the new node.
-        * if the least recently seen node responds to the PING message, then we discard the new node
-          and the least recently seen node becomes the most recently seen node.
+          the bucket and we insert the most recently seen node ID from the insertion pool.
+        * if the least recently seen node responds to the PING message, then it becomes the most recently
+          seen node. The node IDs in the insertion pool are dropped (see the method
+          `__set_bucket_insertion_pool_as_available`).
+
+        Please note: the nodes that are already being "pinged" are not considered (see the configuration
+        parameter "max_concurrent_pings_per_bucket").
+
+        WARNING: precautions must be taken while calling this function!
+                 You must acquire the lock that synchronizes the access to the k-bucket (identified by the
+                 given index) prior to calling the method.
 
         :param bucket_idx: the index of the bucket we want to insert the new node into.
-        :param new_node_to_insert_id: the ID of the new node (to insert into the bucket).
         :param message_request_id: the request ID of the message that triggered this action. Please note that
         this value is only used for logging purposes.
+        :param now: the current date (see class Clock). It is used to compute the expiration date of the PING.
+        :return: the value True if a node has been "pinged" (or found stale), the value False if all the nodes
+        of the k-bucket are already being "pinged".
         """
+        pinged: Set[NodeId] = self.__shared_pinged_nodes[bucket_idx]
+        least_recently_seen_node_id: Optional[NodeId] = self.__get_least_recently_seen(bucket_idx, pinged)
+        if least_recently_seen_node_id is None:
+            return False
+        pinged.add(least_recently_seen_node_id)
         uid = Uid.uid()
-        least_recently_seen_node_id: NodeId = self.__get_least_recently_seen(bucket_idx)
         # Ping the least recently node.
         message = PingNode(uid=uid,
                            sender_id=self.__identifier,
@@ -413,54 +710,80 @@ class RoutingTable(Loggable):
         target_queue: Queue = QueueManager.get_queue(least_recently_seen_node_id)
         if target_queue is None:
             # This means that the target node does not exist anymore.
-            print("{0:04d}> [{1:08d}] The queue for node {2:d} does not exist.".format(self.__identifier,
-                                                                                       message_request_id,
-                                                                                       least_recently_seen_node_id))
-            self.__thread_ping_no_response(message, new_node_to_insert_id)
-            return
-        print("{0:04d}> [{1:08d}] {2:s}".format(self.__identifier, message_request_id, message.to_str()))
+            Logger.trace("{0:04d}> [{1:08d}] The queue for node {2:d} does not exist.",
+                         self.__identifier, message_request_id, least_recently_seen_node_id)
+            # Please note: the lock that synchronizes the access to the k-bucket is already held.
+            self.__replace_node(least_recently_seen_node_id, bucket_idx)
+            return True
+        Logger.trace("{0:04d}> [{1:08d}] {2:s}", self.__identifier, message_request_id, message.to_str())
         Logger.log_message(message, MessageAction.SEND, "ping_for_replacement")
-        message.send()
         # Please don't forget to add the timeout duration to the timestamp
         # (expiration_data = nox + timeout_duration)
+        # Please note: the message is placed under the supervisor responsibility before it is sent. Otherwise,
+        # the response could be processed before the message is supervised (and the message would then expire).
         self.__ping_supervisor.add(message,
-                                   Timestamp(ceil(time()) + self.__config.message_ping_node_timeout),
-                                   new_node_to_insert_id)
+                                   Timestamp(now + Clock.from_seconds(self.__config.message_ping_node_timeout)),
+                                   bucket_index=BucketIndex(bucket_idx))
+        # The queue has already been fetched: don't fetch it again.
+        message.send(target_queue)
+        return True
 
     def __repr__(self) -> str:
         """
         Return a textual representation of the routing table.
+
+        Please note: the representation is built without holding the lock that synchronizes the access to the
+        caches (each k-bucket is copied while holding its own lock). If the k-buckets changed while the
+        representation was being built, then the representation is returned, but it is not cached.
+
         :return: a textual representation of the routing table.
         """
-        with self.__lock_buckets.set("routing_table.RoutingTable.__repr__"):
-            representation: List[str] = [('RT for {0:0%db}' % self.__config.id_length).format(self.__identifier),
-                                         '  Bucket masks:']
-            for i in range(self.__config.id_length):
-                representation.append(("    {0:3d}: {1:0%db}{2:s} (test if ((id >> {3:03d}) ^ mask) == 0)" %
-                                       (self.__config.id_length - i)).format(i, self.__bucket_masks[i], '.' * i, i))
-            representation.append("  Bucket contents:")
-            for i in range(self.__config.id_length):
-                bucket: Bucket = self.__shared_buckets[i]
-                representation.append("    {0:3d}: {1:3d} node(s)".format(i, bucket.count()))
-                if bucket.count():
-                    for p in bucket.get_all_nodes_data():
-                        representation.append('             {0:s}'.format(p.to_str(self.__config.id_length)))
-            return "\n".join(representation)
+        with self.__lock_caches.set("routing_table.RoutingTable.__repr__"):
+            if self.__shared_repr_cache is not None:
+                return self.__shared_repr_cache
+            version: int = self.__shared_repr_version
+        id_length = self.__id_length
+        representation: List[str] = self.__repr_header + ["  Bucket contents:"]
+        # Please note: empty k-buckets are not listed.
+        for i in sorted(self.__get_nonempty_buckets()):
+            nodes: List[NodeData] = self.__shared_buckets[i].get_all_nodes_data()
+            representation.append(f"    {i:3d}: {len(nodes):3d} node(s)")
+            for p in nodes:
+                representation.append(f'             {p.to_str(id_length)}')
+        text: str = "\n".join(representation)
+        with self.__lock_caches.set("routing_table.RoutingTable.__repr__"):
+            if version == self.__shared_repr_version:
+                self.__shared_repr_cache = text
+        return text
 
     def dump(self) -> str:
-        with self.__lock_buckets.set("routing_table.RoutingTable.dump"):
-            counts: List[str] = []
-            for i in range(self.__config.id_length):
-                bucket: Bucket = self.__shared_buckets[i]
-                if bucket.count():
-                    counts.append("{0:d}:[{1:s}]".format(i, ",".join([str(n) for n in bucket.get_all_nodes_ids()])))
-            return "{" + " ".join(counts) + "}"
+        """
+        Return a compact textual representation of the routing table (the node IDs, grouped by k-bucket).
+
+        Please note: see the method `__repr__` for a note about the cache.
+
+        :return: a compact textual representation of the routing table.
+        """
+        with self.__lock_caches.set("routing_table.RoutingTable.dump"):
+            if self.__shared_dump_cache is not None:
+                return self.__shared_dump_cache
+            version: int = self.__shared_dump_version
+        counts: List[str] = []
+        for i in sorted(self.__get_nonempty_buckets()):
+            ids: List[NodeId] = self.__shared_buckets[i].get_all_nodes_ids()
+            if len(ids):
+                counts.append("{0:d}:[{1:s}]".format(i, ",".join(map(str, ids))))
+        text: str = "{" + " ".join(counts) + "}"
+        with self.__lock_caches.set("routing_table.RoutingTable.dump"):
+            if version == self.__shared_dump_version:
+                self.__shared_dump_cache = text
+        return text
 
     def to_dict(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {'log-type': 'routing_table'}
         val: Dict[str, Any] = {}
-        for i in range(self.__config.id_length):
-            bucket: Bucket = self.__shared_buckets[i]
-            val[str(i)] = bucket.get_all_nodes_ids()
+        for i in range(self.__id_length):
+            bucket: Optional[Bucket] = self.__shared_buckets.get(BucketIndex(i))
+            val[str(i)] = [] if bucket is None else bucket.get_all_nodes_ids()
         result['data'] = val
         return result
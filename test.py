@@ -1,6 +1,5 @@
 from typing import List
-from time import sleep
-from random import randint
+from threading import Barrier
 from kad_config import KadConfig
 from kad_types import NodeId
 from node import Node
@@ -13,15 +12,17 @@ Logger.init("kad.txt")
 origin_id: NodeId = NodeId(0)
 conf: KadConfig = KadConfig(id_length=8, alpha=3, k=3)
 Logger.log_config(conf)
+nodes_count: int = 10
+# All the nodes start processing messages at the same time.
+barrier: Barrier = Barrier(nodes_count)
 
-origin = Node(NodeId(origin_id), conf)
+origin = Node(NodeId(origin_id), conf, barrier=barrier)
 origin.run()
 
-nodes: List[Node] = [Node(NodeId(i), conf, origin=origin_id) for i in range(1, 10)]
+nodes: List[Node] = [Node(NodeId(i), conf, origin=origin_id, barrier=barrier) for i in range(1, nodes_count)]
 
 for node in nodes:
     node.run()
-    sleep(randint(50, 300) / 1000)
 
 for node in nodes:
     node.join(timeout=1)
@@ -0,0 +1,44 @@
+import os
+import unittest
+
+from lock import ExtLock
+from bucket import Bucket, BucketAddResult
+from kad_types import NodeId
+from node_data import NodeData
+
+ExtLock.init(os.devnull, enabled=False)
+
+
+class TestBucket(unittest.TestCase):
+
+    def test_add_node(self):
+        bucket = Bucket(2)
+        self.assertIs(bucket.add_node(NodeData(NodeId(1), last_seen_date=0)), BucketAddResult.ADDED)
+        self.assertIs(bucket.add_node(NodeData(NodeId(1), last_seen_date=0)), BucketAddResult.ALREADY_IN)
+        self.assertIs(bucket.add_node(NodeData(NodeId(2), last_seen_date=0)), BucketAddResult.ADDED)
+        self.assertIs(bucket.add_node(NodeData(NodeId(3), last_seen_date=0)), BucketAddResult.FULL)
+        self.assertEqual(bucket.count(), 2)
+
+    def test_same_dates_follow_insertion_order(self):
+        # The nodes share the same "last seen" date. The removal of the first node moves the last node to the
+        # first position: this must not change the order of the remaining nodes.
+        bucket = Bucket(3)
+        for node_id in (1, 2, 3):
+            bucket.add_node(NodeData(NodeId(node_id), last_seen_date=0))
+        bucket.remove_node(NodeId(1))
+        self.assertEqual(bucket.get_least_recently_seen(), NodeId(2))
+        self.assertEqual(bucket.get_most_recently_seen(), NodeId(3))
+        self.assertEqual(bucket.get_least_recently_seen({NodeId(2)}), NodeId(3))
+        self.assertIsNone(bucket.get_least_recently_seen({NodeId(2), NodeId(3)}))
+
+    def test_most_recently_seen(self):
+        bucket = Bucket(3)
+        for node_id in (1, 2, 3):
+            bucket.add_node(NodeData(NodeId(node_id), last_seen_date=0))
+        bucket.set_most_recently_seen(NodeId(1))
+        self.assertEqual(bucket.get_least_recently_seen(), NodeId(2))
+        self.assertEqual(bucket.get_most_recently_seen(), NodeId(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
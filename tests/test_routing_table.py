@@ -0,0 +1,146 @@
+import os
+import random
+import time
+import unittest
+from queue import Queue
+from threading import Thread
+from typing import List, Set
+
+from lock import ExtLock
+from logger import Logger
+from kad_config import KadConfig
+from kad_types import NodeId
+from message.message import Message
+from message.ping_node import PingNode
+from message.ping_node_reponse import PingNodeResponse
+from queue_manager import QueueManager
+from routing_table import RoutingTable
+
+ExtLock.init(os.devnull, enabled=False)
+Logger.init(os.devnull, trace=False)
+
+LOCAL_NODE_ID = NodeId(0)
+
+
+class Responder(object):
+    """
+    Receive the PING messages sent by the routing table to a set of nodes. The nodes which IDs are in the set
+    "alive" respond to the PING messages, the other ones don't.
+    """
+
+    def __init__(self, node_ids: List[NodeId], alive: Set[NodeId]):
+        self.pinged: List[NodeId] = []
+        """The IDs of the "pinged" nodes, in the order of the PING messages."""
+        self.routing_table: RoutingTable = None
+        self.__node_ids: List[NodeId] = node_ids
+        self.__alive: Set[NodeId] = alive
+        self.__queue: Queue = Queue()
+        for node_id in node_ids:
+            QueueManager.add_queue(node_id, self.__queue)
+        self.__thread: Thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            message = self.__queue.get()
+            if message is None:
+                return
+            self.pinged.append(message.recipient)
+            if message.recipient in self.__alive:
+                self.routing_table.notify_ping_response(
+                    PingNodeResponse(0, message.recipient, LOCAL_NODE_ID, message.request_id))
+
+    def stop(self) -> None:
+        for node_id in self.__node_ids:
+            QueueManager.del_queue(node_id)
+        self.__queue.put(None)
+        self.__thread.join()
+
+
+class TestRoutingTable(unittest.TestCase):
+
+    def setUp(self):
+        self.config = KadConfig(id_length=8, k=2, message_ping_node_timeout=1, inserter_scanner_period=1)
+        self.routing_table = RoutingTable(LOCAL_NODE_ID, self.config)
+
+    def tearDown(self):
+        self.routing_table.stop()
+
+    def wait_for(self, predicate, duration: float) -> bool:
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.1)
+        return predicate()
+
+    def bucket(self, index: int) -> List[int]:
+        return self.routing_table.to_dict()['data'][str(index)]
+
+    def test_find_closest(self):
+        # Compare the result with the one of a brute-force XOR sort of all the nodes of the routing table.
+        generator = random.Random(0)
+        config = KadConfig(id_length=12, k=4)
+        local_node_id = NodeId(generator.getrandbits(12))
+        routing_table = RoutingTable(local_node_id, config)
+        try:
+            for _ in range(300):
+                node_id = NodeId(generator.getrandbits(12))
+                if node_id != local_node_id:
+                    routing_table.add_node(node_id)
+            node_ids = [NodeId(node_id) for ids in routing_table.to_dict()['data'].values() for node_id in ids]
+            for _ in range(200):
+                target = NodeId(generator.getrandbits(12))
+                for count in (1, 4, 20, len(node_ids) + 1):
+                    expected = sorted(node_ids, key=lambda node_id: node_id ^ target)[0:count]
+                    self.assertEqual(routing_table.find_closest(target, count), expected)
+        finally:
+            routing_table.stop()
+
+    def test_node_that_responds_is_not_pinged_again(self):
+        # Nodes 128 and 129 fill the k-bucket 7. The node 128 (the least recently seen one) is "pinged" when the
+        # node 130 is discovered. It responds: it becomes the most recently seen node. Thus, it must not be
+        # "pinged" again (nor evicted) before the node 129.
+        responder = Responder([NodeId(128), NodeId(129)], {NodeId(128)})
+        responder.routing_table = self.routing_table
+        self.routing_table.add_node(NodeId(128))
+        self.routing_table.add_node(NodeId(129))
+        self.routing_table.add_node(NodeId(130), PingNode(0, NodeId(130), LOCAL_NODE_ID,
+                                                          Message.get_new_request_id()))
+        self.wait_for(lambda: len(responder.pinged) >= 2, 3)
+        responder.stop()
+        self.assertEqual(responder.pinged[0], NodeId(128))
+        self.assertEqual(responder.pinged.count(NodeId(128)), 1)
+        self.assertIn(NodeId(128), self.bucket(7))
+
+    def test_full_bucket_which_nodes_respond(self):
+        # The least recently seen node responds: the discovered node is dropped, and the k-bucket is not
+        # "pinged" again.
+        responder = Responder([NodeId(128), NodeId(129)], {NodeId(128), NodeId(129)})
+        responder.routing_table = self.routing_table
+        self.routing_table.add_node(NodeId(128))
+        self.routing_table.add_node(NodeId(129))
+        self.routing_table.add_node(NodeId(130), PingNode(0, NodeId(130), LOCAL_NODE_ID,
+                                                          Message.get_new_request_id()))
+        self.wait_for(lambda: len(responder.pinged) >= 2, 3)
+        responder.stop()
+        self.assertEqual(responder.pinged, [NodeId(128)])
+        self.assertEqual(self.bucket(7), [128, 129])
+
+    def test_full_bucket_which_least_recently_seen_node_times_out(self):
+        # The least recently seen node does not respond: it is replaced by the discovered node.
+        responder = Responder([NodeId(128), NodeId(129)], {NodeId(129)})
+        responder.routing_table = self.routing_table
+        self.routing_table.add_node(NodeId(128))
+        self.routing_table.add_node(NodeId(129))
+        self.routing_table.add_node(NodeId(130), PingNode(0, NodeId(130), LOCAL_NODE_ID,
+                                                          Message.get_new_request_id()))
+        replaced = self.wait_for(lambda: NodeId(128) not in self.bucket(7), 10)
+        responder.stop()
+        self.assertTrue(replaced)
+        self.assertEqual(responder.pinged, [NodeId(128)])
+        self.assertEqual(sorted(self.bucket(7)), [129, 130])
+
+
+if __name__ == '__main__':
+    unittest.main()
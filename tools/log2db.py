@@ -1,10 +1,14 @@
-from typing import Optional, Pattern, Match
+from typing import List, Tuple
 import sqlite3
 import argparse
 import os
 import sys
 import json
-import re
+try:
+    # orjson is much faster than the standard JSON decoder, but it is optional.
+    import orjson
+except ImportError:
+    orjson = None
 
 
 SCHEMA = """
@@ -15,8 +19,6 @@ CREATE TABLE data (
     node_id          INTEGER NOT NULL,
     data             TEXT
 );
-CREATE INDEX message_message_uid_index ON data (message_uid);
-CREATE INDEX message_node_id_index ON data (node_id);
 
 CREATE TABLE message (
     id            INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,16 +30,37 @@ CREATE TABLE message (
     recipient_id  INTEGER NOT NULL,
     args          TEXT
 );
+"""
+
+# Please note: the indexes are created once the database is loaded. Updating the indexes for every inserted
+# row is much slower than building them once for all.
+INDEXES = """
+CREATE INDEX message_message_uid_index ON data (message_uid);
+CREATE INDEX message_node_id_index ON data (node_id);
+
 CREATE INDEX message_action_index ON message (action);
 CREATE INDEX message_type_index ON message (name);
 CREATE INDEX uid_index ON message (uid);
 CREATE INDEX request_id_index ON message (request_id);
 CREATE INDEX sender_id_index ON message (sender_id);
 CREATE INDEX recipient_id ON message (recipient_id);
+CREATE INDEX message_action_request_id_index ON message (action, request_id);
+"""
 
+# The database is created from scratch (and it can be recreated from the LOG file at any time). Thus, there
+# is no need to protect it against crashes.
+PRAGMAS = """
+PRAGMA journal_mode = OFF;
+PRAGMA synchronous = OFF;
+PRAGMA temp_store = MEMORY;
+"""
 
+BATCH_SIZE = 10000
+"""The number of rows inserted at once."""
 
-"""
+INSERT_MESSAGE = "INSERT INTO message (action, name, uid, request_id, sender_id, recipient_id, args) " \
+                 "VALUES (?, ?, ?, ?, ?, ?, ?)"
+INSERT_DATA = "INSERT INTO data (type, message_uid, node_id, data) VALUES (?, ?, ?, ?)"
 
 # Parse the command line.
 
@@ -70,53 +93,73 @@ con = sqlite3.connect(db_path)
 cursor: sqlite3.Cursor = con.cursor()
 
 try:
-    for statement in SCHEMA.split(";"):
-        cursor.execute(statement)
+    cursor.executescript(PRAGMAS)
+    cursor.executescript(SCHEMA)
 except sqlite3.Error as e:
     print("An error occurred:", e.args[0])
     sys.exit(1)
 
 # Parse the LOG file and load the database.
 
-comment: Pattern = re.compile('^#')
-
-
-with open(log_path, "r") as fd:
-    while True:
-        line: Optional[str] = fd.readline()
-        # The readline() method doesn't trigger the end-of-file condition. Instead, when data is exhausted,
-        # it returns an empty string.
-        if len(line) == 0:
-            break
+messages: List[Tuple] = []
+"""The rows to insert into the table "message"."""
+data: List[Tuple] = []
+"""The rows to insert into the table "data"."""
+
+loads = json.loads
+"""The JSON parser. The standard one is used until the configuration (which gives the length of the node IDs) is
+found."""
+# Please note: the file is read in binary mode. Lines are only decoded by the JSON parser (which accepts bytes),
+# and comments are skipped without being decoded at all.
+with open(log_path, "rb") as fd:
+    for line in fd:
         line = line.rstrip()
         if len(line) == 0:
-            print("ERROR: Unexpected line: \"{0:s}\" (line is empty).".format(line))
+            print("ERROR: Unexpected line: \"\" (line is empty).")
             sys.exit(1)
-        m: Optional[Match] = comment.match(line)
-        if m is not None:
+        if line.startswith(b'#'):
+            continue
+
+        log = loads(line)
+        if log['log-type'] == 'config':
+            # Please note: orjson parses integers that do not fit in 64 bits as (lossy) floats. Thus, it is only
+            # used if the node IDs fit in 64 bits.
+            if orjson is not None and log['id_length'] <= 64:
+                loads = orjson.loads
             continue
 
-        log = json.loads(line)
         if log['log-type'] == 'message':
             # For the message "TERMINATE_NODE", the sender_id is not defined.
             if log['name'] == 'TERMINATE_NODE':
                 continue
-            cursor.execute("INSERT INTO message (action, name, uid, request_id, sender_id, recipient_id, args) "
-                           "VALUES (?, ?, ?, ?, ?, ?, ?)", (log['action'],
-                                                            log['name'],
-                                                            log["uid"],
-                                                            log['request_id'],
-                                                            log['sender_id'],
-                                                            log['recipient_id'],
-                                                            log['args'] if 'args' in log else None))
+            messages.append((log['action'],
+                             log['name'],
+                             log["uid"],
+                             log['request_id'],
+                             log['sender_id'],
+                             log['recipient_id'],
+                             log['args'] if 'args' in log else None))
+            if len(messages) == BATCH_SIZE:
+                cursor.executemany(INSERT_MESSAGE, messages)
+                messages.clear()
             continue
 
         if log['log-type'] == 'data':
-            cursor.execute("INSERT INTO data (type, message_uid, node_id, data) VALUES (?, ?, ?, ?)",
-                           (log['type'], log['message_uid'], log['node_id'], log['data']))
+            data.append((log['type'], log['message_uid'], log['node_id'], log['data']))
+            if len(data) == BATCH_SIZE:
+                cursor.executemany(INSERT_DATA, data)
+                data.clear()
             continue
 
+cursor.executemany(INSERT_MESSAGE, messages)
+cursor.executemany(INSERT_DATA, data)
+con.commit()
+
+try:
+    cursor.executescript(INDEXES)
+except sqlite3.Error as e:
+    print("An error occurred:", e.args[0])
+    sys.exit(1)
 
 con.commit()
 con.close()
-
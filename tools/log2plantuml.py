@@ -21,6 +21,7 @@ from typing import Dict, Optional, List, Any
 import sys
 import sqlite3
 import argparse
+from collections import defaultdict
 
 
 colors: Dict[str, str] = {
@@ -31,10 +32,8 @@ colors: Dict[str, str] = {
 }
 
 
-def type2color(type: str) -> str:
-    if type in colors:
-        return colors[type]
-    return "#000000"
+def type2color(msg_type: str) -> str:
+    return colors.get(msg_type, "#000000")
 
 
 def get_nodes(connexion: sqlite3.Connection) -> List[str]:
@@ -43,87 +42,51 @@ def get_nodes(connexion: sqlite3.Connection) -> List[str]:
     :param connexion: the connexion handler.
     :return: the list of nodes.
     """
-    cursor = sqlite3.Cursor = connexion.cursor()
-    cursor.execute("SELECT DISTINCT(sender_id) FROM message ORDER BY sender_id")
-    entry = cursor.fetchall()
-    if entry is None:
+    cursor: sqlite3.Cursor = connexion.cursor()
+    cursor.execute("SELECT sender_id AS id FROM message UNION SELECT recipient_id FROM message ORDER BY id")
+    nodes: List[str] = [f"entity node{n[0]:d}" for n in cursor]
+    if not nodes:
         print("The database is empty. Abort!")
         sys.exit(0)
-    sender_ids = [n for n in entry]
+    return nodes
 
-    cursor.execute("SELECT DISTINCT(recipient_id) FROM message ORDER BY recipient_id")
-    entry = cursor.fetchall()
-    if entry is None:
-        print("The database is empty. Abort!")
-        sys.exit(0)
-    recipient_ids = [n for n in entry]
-
-    sender_ids.extend(recipient_ids)
-    nodes_ids = {identifier: None for identifier in sender_ids}.keys()
-    return ["entity node{0:d}".format(n[0]) for n in nodes_ids]
 
-
-def get_log(cursor: sqlite3.Cursor) -> Optional[Dict[str, Any]]:
-    """
-    Get the next row from the cursor that points to the messages selection.
-    :param cursor: the cursor that points to the messages selection.
-    :return: the next row.
-    """
-    entry = cursor.fetchone()
-    if entry is None:
-        return None
-    return {
-        "action": entry[0],
-        "type": entry[1],
-        "uid": entry[2],
-        "request_id": entry[3],
-        "sender_id": entry[4],
-        "recipient_id": entry[5],
-        "args": entry[6]
-    }
-
-
-def has_response(connexion: sqlite3.Connection, request_id: int) -> bool:
+def has_response(responses_count: Optional[int], request_id: int) -> bool:
     """
     Test whether an SQL request has a response or not.
-    :param connexion: the connection handler to SQLite.
+    :param responses_count: the number of responses received for the request. The value None means that no
+    response has been received.
     :param request_id: the request ID.
     :return: if the message has a response, the function returns the value True.
     Otherwise, it returns the value False.
     """
-    cursor = sqlite3.Cursor = connexion.cursor()
-    cursor.execute("SELECT id FROM message WHERE action='receive' AND request_id=?", (request_id,))
-    # print("SELECT id FROM message WHERE action='receive' AND request_id={}".format(request_id,))
-    count = len(cursor.fetchall())
-    if count > 1:
+    if responses_count is None:
+        return False
+    if responses_count > 1:
         raise Exception("ERROR: SELECT id FROM message WHERE action='receive' AND request_id={}"
                         "=> count > 1".format(request_id,))
-    return count > 0
+    return responses_count > 0
 
 
-def get_data(connexion: sqlite3.Connection, message_uid: int) -> List[Dict[str, Any]]:
+def get_data(connexion: sqlite3.Connection) -> Dict[int, List[Dict[str, Any]]]:
     """
-    Get the data bound to a given message identified by its message UID.
+    Get the data bound to the messages.
     :param connexion: the SQLite connector.
-    :param message_uid: The message UID.
-    :return: the list of data.
+    :return: a dictionary that associates a message UID with the list of data bound to the message.
+    Messages that have no data are not in the dictionary.
     """
-    cursor = sqlite3.Cursor = connexion.cursor()
-    cursor.execute("SELECT data.id, data.type, data.node_id, data.data "
-                   "FROM data, message "
-                   "WHERE data.message_uid=? AND message.uid=?",
-                   (message_uid, message_uid,))
-
-    result: List[Dict[str, Any]] = []
-    while True:
-        entry = cursor.fetchone()
-        if entry is None:
-            break
-        result.append({
-            "id": entry[0],
-            "type": entry[1],
-            "node_id": entry[2],
-            "data": entry[3]
+    cursor: sqlite3.Cursor = connexion.cursor()
+    cursor.execute("SELECT data.message_uid, data.id, data.type, data.node_id, data.data "
+                   "FROM data JOIN message ON data.message_uid=message.uid "
+                   "ORDER BY data.id")
+
+    result: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for entry in cursor:
+        result[entry[0]].append({
+            "id": entry[1],
+            "type": entry[2],
+            "node_id": entry[3],
+            "data": entry[4]
         })
     return result
 
@@ -139,50 +102,56 @@ parser.add_argument('--db',
 args = parser.parse_args()
 db_path = args.db if args.db is not None else "log.db"
 
-con: sqlite3.Connection = sqlite3.connect(db_path)
-cursor1: sqlite3.Cursor = con.cursor()
-cursor2: sqlite3.Cursor = con.cursor()
-cursor3: sqlite3.Cursor = con.cursor()
+# Please note: the database is only read. Thus, there is no need to open transactions (autocommit mode).
+con: sqlite3.Connection = sqlite3.connect(db_path, cached_statements=256, isolation_level=None)
+# Please note: the database is only read. Thus, the journal mode is not changed (this would modify the database).
+con.executescript("PRAGMA temp_store = MEMORY; PRAGMA cache_size = -65536; PRAGMA mmap_size = 268435456;")
+cursor: sqlite3.Cursor = con.cursor()
 
 # Extract the nodes IDs from the database
 nodes = get_nodes(con)
-
-print("@startuml")
-print("\n".join(nodes))
-
-cursor1.execute("SELECT action, name, uid, request_id, sender_id, recipient_id, args FROM message ORDER BY id")
-
-while True:
-
-    log = get_log(cursor1)
-    if log is None:
-        break
-
-    data = get_data(con, log["uid"])
-
-    color = type2color(log["type"])
-    if log['action'] == 'send':
-        message_has_response = has_response(con, log["request_id"])
-        arrow = "-[{:s}]>".format(color) if message_has_response else "-[{:s}]>X".format(color)
+data_by_uid: Dict[int, List[Dict[str, Any]]] = get_data(con)
+
+# Please note: the lines of the output are collected, and then they are written all at once.
+out: List[str] = ["@startuml"]
+out.extend(nodes)
+
+# Please note: the number of responses received for each request is computed by SQLite (it is joined to the
+# messages), rather than by one SELECT per message.
+cursor.execute("SELECT m.action, m.name, m.uid, m.request_id, m.sender_id, m.recipient_id, m.args, r.count "
+               "FROM message AS m "
+               "LEFT JOIN (SELECT request_id, COUNT(id) AS count FROM message WHERE action='receive' "
+               "           GROUP BY request_id) AS r "
+               "ON r.request_id=m.request_id "
+               "ORDER BY m.id")
+
+# Please note: the methods used in the loop are bound once for all (instead of being looked up for each message).
+append = out.append
+get_message_data = data_by_uid.get
+no_data: List[Dict[str, Any]] = []
+for action, name, uid, request_id, sender_id, recipient_id, message_args, responses_count in cursor:
+
+    data = get_message_data(uid, no_data)
+
+    color = type2color(name)
+    if action == 'send':
+        message_has_response = has_response(responses_count, request_id)
+        arrow = f"-[{color:s}]>" if message_has_response else f"-[{color:s}]>X"
     else:
-        arrow = "-[{:s}]>".format(color)
+        arrow = f"-[{color:s}]>"
 
-    args = "" if log["args"] is None else log["args"]
+    message_args = "" if message_args is None else message_args
 
-    print("node{0:d} {1:s} node{2:d}:[{3:d}] {4:s} <{5:s}>".format(log["sender_id"],
-                                                                   arrow,
-                                                                   log["recipient_id"],
-                                                                   log["request_id"],
-                                                                   log["type"],
-                                                                   args))
+    append(f"node{sender_id:d} {arrow:s} node{recipient_id:d}:[{request_id:d}] {name:s} <{message_args:s}>")
 
     if len(data) > 0:
         prefix = ""
         for d in data:
-            print("{:s}note over node{:d}:{:s}".format(prefix, d['node_id'], d["data"]))
+            append(f"{prefix:s}note over node{d['node_id']:d}:{d['data']:s}")
             prefix = " / "
 
 
-print("@endtuml")
-print("# \"C:\\Program Files (x86)\\Common Files\\Oracle\\Java\\javapath\"\\java.exe -jar \"C:\\Users\\Denis BEURIVE\\Documents\\software\"\\plantuml.jar <file>")
+out.append("@endtuml")
+out.append("# \"C:\\Program Files (x86)\\Common Files\\Oracle\\Java\\javapath\"\\java.exe -jar \"C:\\Users\\Denis BEURIVE\\Documents\\software\"\\plantuml.jar <file>")
+sys.stdout.write("\n".join(out) + "\n")
 
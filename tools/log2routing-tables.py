@@ -1,9 +1,8 @@
-from typing import Optional, Pattern, Match, List, Tuple
+from typing import Optional, List
 import argparse
 import os
 import sys
 import json
-import re
 
 
 document_header = """
@@ -47,47 +46,52 @@ def get_mask(in_current_node: int, bucket_index: int):
 
 
 def dec_to_bin(n, in_len: int) -> str:
-    v = bin(n).replace("0b", "")
-    return '0'*(in_len-len(v)) + v
+    return format(n, f'0{in_len}b')
 
 
-def get_expected_ids(bucket_index: int, in_masks: List[int]) -> Tuple[int, int]:
-    right_max = pow(2, bucket_index) - 1
-    v_min = in_masks[bucket_index]
-    v_max = in_masks[bucket_index] | right_max
-    return v_min, v_max
+def get_right_max(in_config: dict) -> List[int]:
+    """
+    Get the values of the lowest bits of the IDs that belong to each bucket, when all these bits are set to 1.
+    Please note: the table depends on the configuration only. Thus, it is computed once for all.
+    :param in_config: the configuration.
+    :return: the list of values. The value at index I is (2^I - 1).
+    """
+    return [(1 << i) - 1 for i in range(in_config['id_length'])]
 
 
-def rt2html(in_rt: dict, in_config: dict) -> str:
+def rt2html(in_rt: dict, in_config: dict, in_right_max: List[int]) -> str:
     rt: dict = in_rt['data']
     current_node: int = in_rt['node_id']
-    masks: List[int] = [get_mask(current_node, i) for i in range(in_config['id_length'])]
-    lines: List[str] = ["<b>Node {}</b><table>\n".format(current_node),
+    k: int = in_config['k']
+    id_length: int = in_config['id_length']
+    masks: List[int] = [get_mask(current_node, i) for i in range(id_length)]
+    lines: List[str] = [f"<b>Node {current_node}</b><table>\n",
                         '  <tr>',
-                        '<th>bucket</th><th>min</th><th>max</th>']
-    lines.extend(['<th>&nbsp;.&nbsp;</th>' for _ in range(in_config['k'])])
-    lines.append("<th>expected</th></tr>\n")
-
-    for bucket_index in range(in_config['id_length']):
-        dist_min = pow(2, bucket_index)
-        dist_max = 2*dist_min
-
-        lines.append('  <tr><td>{}</td>'
-                     '<td>{}</td><td>{}</td>'.format(bucket_index, dist_min, dist_max))
-        for list_index in range(in_config['k']):
-            if len(rt[str(bucket_index)]) > list_index:
-                node = rt[str(bucket_index)][list_index]
-                distance = current_node ^ node
-                lines.append('<td>{}(<span class="dist">{}</span>)</td>'.format(node, distance))
-            else:
-                lines.append('<td>&nbsp;</td>')
-        v_min, v_max = get_expected_ids(bucket_index, masks)
+                        '<th>bucket</th><th>min</th><th>max</th>',
+                        '<th>&nbsp;.&nbsp;</th>' * k,
+                        "<th>expected</th></tr>\n"]
+    append = lines.append
+    empty_cell: str = '<td>&nbsp;</td>'
+
+    for bucket_index in range(id_length):
+        dist_min = 1 << bucket_index
+        dist_max = dist_min << 1
+
+        append(f'  <tr><td>{bucket_index}</td>'
+               f'<td>{dist_min}</td><td>{dist_max}</td>')
+        bucket: List[int] = rt[str(bucket_index)]
+        for node in bucket[:k]:
+            append(f'<td>{node}(<span class="dist">{current_node ^ node}</span>)</td>')
+        if len(bucket) < k:
+            append(empty_cell * (k - len(bucket)))
+        v_min = masks[bucket_index]
+        v_max = v_min | in_right_max[bucket_index]
         if v_min != v_max:
-            lines.append('<td>[{}, {}]</td>'.format(v_min, v_max))
+            append(f'<td>[{v_min}, {v_max}]</td>')
         else:
-            lines.append('<td>{}</td>'.format(v_min))
-        lines.append("</tr>\n")
-    lines.append("</table>\n")
+            append(f'<td>{v_min}</td>')
+        append("</tr>\n")
+    append("</table>\n")
     return "".join(lines)
 
 
@@ -116,42 +120,38 @@ except Exception as e:
     print("Cannot remove the file \"{0:s}\"!".format(output_path))
     sys.exit(1)
 
-comment: Pattern = re.compile('^#')
 config: Optional[dict] = None
-lines: List[str] = [document_header]
-with open(log_path, "r") as fd:
-    while True:
-        line: Optional[str] = fd.readline()
-        # The readline() method doesn't trigger the end-of-file condition. Instead, when data is exhausted,
-        # it returns an empty string.
-        if len(line) == 0:
-            break
+separator: str = "\n<br/><br/>"
+# Please note: the HTML document is written while the LOG file is parsed (it is not kept in memory).
+loads = json.loads
+with open(log_path, "rb") as fd, open(output_path, 'w') as fd_out:
+    fd_out.write(document_header)
+    # Please note: the LOG file is read in binary mode (see log2db.py). Comments are skipped without being decoded.
+    for line in fd:
         line = line.rstrip()
 
         if len(line) == 0:
-            print("ERROR: Unexpected line: \"{0:s}\" (line is empty).".format(line))
+            print("ERROR: Unexpected line: \"\" (line is empty).")
             sys.exit(1)
 
-        m: Optional[Match] = comment.match(line)
-        if m is not None:
+        if line.startswith(b'#'):
             continue
 
-        log = json.loads(line)
+        log = loads(line)
 
         if log['log-type'] == 'config':
             if config is not None:
                 print('ERROR: config LOG found more than once!')
                 sys.exit(1)
             config = log
+            right_max: List[int] = get_right_max(config)
             continue
 
         if log['log-type'] != 'routing_table':
             continue
 
-        lines.append(rt2html(log, config))
-
-lines.append(document_footer)
-
-with open(output_path, 'w') as fd:
-    fd.write("\n<br/><br/>".join(lines))
+        fd_out.write(separator)
+        fd_out.write(rt2html(log, config, right_max))
 
+    fd_out.write(separator)
+    fd_out.write(document_footer)
@@ -1,13 +1,13 @@
-from lock import ExtLock
+from itertools import count
 
 
 class Uid:
 
-    __shared_uid = 0
-    __lock_uid = ExtLock("Uid.uid")
+    __shared_uid = count(1)
+    """The generator of unique IDs.
+    Please note: `next` on an instance of `itertools.count` is executed as a single (C) call, while the GIL is
+    held. Thus, it is atomic: no lock is required."""
 
     @staticmethod
     def uid() -> int:
-        with Uid.__lock_uid.set("uid.Uid.uid"):
-            Uid.__shared_uid += 1
-            return Uid.__shared_uid
+        return next(Uid.__shared_uid)